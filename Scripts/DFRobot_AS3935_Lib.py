@@ -189,14 +189,14 @@ class DFRobot_AS3935:
     @return lightning energy intensity(0-1000)
   '''
   def get_strike_energy_raw(self):
-    self.sing_reg_read(0x06) #MMSB, shift 8  bits left, make room for MSB
-    nrgyRaw = (self.register[0]&0x1F) << 8
-    self.sing_reg_read(0x05) #read MSB
-    nrgyRaw |= self.register[0]
-    nrgyRaw <<= 8 #shift 8 bits left, make room for LSB
-    self.sing_reg_read(0x04) #read LSB, add to others
-    nrgyRaw |= self.register[0]
-        
+    #energy registers 0x04 (LSB), 0x05 (MSB) and 0x06 (MMSB) are adjacent and
+    #read_data fetches a block starting at the given register, so one bus
+    #transaction covers all three instead of three round-trips
+    self.sing_reg_read(0x04)
+    nrgyRaw = (self.register[2]&0x1F) << 16 #MMSB
+    nrgyRaw |= self.register[1] << 8 #MSB
+    nrgyRaw |= self.register[0] #LSB
+
     return nrgyRaw/16777
 
   def set_min_strikes(self, minStrk):
@@ -1,6 +1,9 @@
 import RPi.GPIO as GPIO
 import time
+import threading
 import subprocess
+import collections
+import wave
 import os
 
 # Pin where the AS3935 lightning sensor is connected
@@ -9,41 +12,86 @@ THUNDER_PIN = 17  # Change this to the correct GPIO pin you're using
 # Audio Recording Settings
 DEVICE = "plughw:1,0"  # Adjust based on your input device, use 'arecord -l' to find it
 RECORDING_LENGTH = 60  # Seconds
+PRE_ROLL_SECONDS = 1   # Seconds of audio kept from before the trigger
 
-recording_process = None
+# Capture format matches arecord's "cd" preset: 44.1 kHz, 16-bit, stereo.
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2  # bytes per sample
+CHUNK_FRAMES = SAMPLE_RATE // 10  # 100 ms of audio per chunk
+CHUNK_BYTES = CHUNK_FRAMES * CHANNELS * SAMPLE_WIDTH
+
+capture_process = None
 recording_start_time = None
 
+# Ring buffer of the most recent chunks, so a recording can include audio
+# from just before the strike. Spawning arecord per event costs hundreds of
+# ms of ALSA device open, during which the start of the thunder is lost;
+# instead one arecord runs for the lifetime of the script and we only gate
+# its output to disk.
+ring = collections.deque(maxlen=int(PRE_ROLL_SECONDS * 10))
+active_chunks = None  # List collecting the recording in progress, or None
+
+# Set by the GPIO callback so the main thread can block instead of polling.
+thunder_event = threading.Event()
+# Guards the recording globals shared between the callback and the main thread.
+state_lock = threading.Lock()
+
+# Reader thread: drains the persistent arecord pipe into the ring buffer
+def capture_loop():
+    global active_chunks
+    while True:
+        chunk = capture_process.stdout.read(CHUNK_BYTES)
+        if not chunk:
+            break
+        with state_lock:
+            ring.append(chunk)
+            if active_chunks is not None:
+                active_chunks.append(chunk)
+
 # Function to start audio recording
 def start_recording():
-    global recording_process, recording_start_time
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
-    filename = f"thunder_{timestamp}.wav"
-    print(f"Recording started: {filename}")
-    
-    # Start recording using arecord
-    recording_process = subprocess.Popen(['arecord', '-D', DEVICE, '-f', 'cd', filename])
+    global active_chunks, recording_start_time
+    print("Recording started (including pre-roll)")
+    # Snapshot the ring so the file starts ~PRE_ROLL_SECONDS before the strike
+    active_chunks = list(ring)
     recording_start_time = time.time()
 
-# Function to stop audio recording
+# Function to stop audio recording and write the WAV on a worker thread
 def stop_recording():
-    global recording_process
-    if recording_process is not None:
-        print("Stopping recording...")
-        recording_process.terminate()
-        recording_process = None
+    global active_chunks
+    if active_chunks is None:
+        return
+    chunks = active_chunks
+    active_chunks = None
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    filename = f"thunder_{timestamp}.wav"
+    print("Stopping recording...")
+    threading.Thread(target=write_wav, args=(filename, chunks), daemon=True).start()
+
+def write_wav(filename, chunks):
+    with wave.open(filename, 'wb') as wav_file:
+        wav_file.setnchannels(CHANNELS)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(b''.join(chunks))
+    print(f"Recording saved: {filename}")
 
 # Function to handle the thunder detection
 def handle_thunder_detected(channel):
     global recording_start_time
-    
+
     print("Thunder detected!")
-    
-    if recording_process is None:
-        # Start a new recording
-        start_recording()
-    else:
-        # Reset the recording timer if already recording
-        recording_start_time = time.time()
+
+    with state_lock:
+        if active_chunks is None:
+            # Start a new recording
+            start_recording()
+        else:
+            # Reset the recording timer if already recording
+            recording_start_time = time.time()
+    # Wake the main thread so it can recompute its deadline
+    thunder_event.set()
 
 # GPIO Setup
 GPIO.setmode(GPIO.BCM)
@@ -52,19 +100,46 @@ GPIO.setup(THUNDER_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
 # Attach the thunder detection handler to the GPIO pin
 GPIO.add_event_detect(THUNDER_PIN, GPIO.RISING, callback=handle_thunder_detected)
 
+# Start the persistent capture pipeline
+capture_process = subprocess.Popen(
+    ['arecord', '-D', DEVICE, '-f', 'cd', '-t', 'raw'],
+    stdout=subprocess.PIPE,
+    bufsize=CHUNK_BYTES
+)
+threading.Thread(target=capture_loop, daemon=True).start()
+
 print("Listening for thunder...")
 
 try:
     while True:
-        # If we're recording, check if the recording timer needs to be reset or stopped
-        if recording_process and (time.time() - recording_start_time > RECORDING_LENGTH):
-            stop_recording()
-        
-        time.sleep(0.1)  # A small delay to prevent high CPU usage
+        # Block until the next thunder event, or until the current recording
+        # is due to stop. Idle (not recording) means we sleep indefinitely
+        # instead of waking 10 times a second to poll.
+        with state_lock:
+            if active_chunks is None:
+                timeout = None
+            else:
+                timeout = RECORDING_LENGTH - (time.time() - recording_start_time)
+
+        if timeout is not None and timeout <= 0:
+            with state_lock:
+                stop_recording()
+            continue
+
+        if thunder_event.wait(timeout):
+            # Thunder fired: the callback already started/extended the
+            # recording, we just need to recompute the deadline.
+            thunder_event.clear()
+        else:
+            # Timed out: the recording has run its full length.
+            with state_lock:
+                stop_recording()
 
 except KeyboardInterrupt:
     print("Exiting...")
-    if recording_process:
+    with state_lock:
         stop_recording()
 finally:
+    if capture_process:
+        capture_process.terminate()
     GPIO.cleanup()
@@ -2,6 +2,8 @@ import sys
 import os
 import time
 import json
+import select
+import socket
 import logging
 import threading
 import argparse # Import argparse
@@ -39,7 +41,7 @@ except (ImportError, RuntimeError):
         RISING = 1
         def setmode(self, mode): pass
         def setup(self, pin, mode): pass
-        def add_event_detect(self, pin, edge, callback): pass
+        def add_event_detect(self, pin, edge, callback, bouncetime=None): pass
         def cleanup(self): pass
 
 
@@ -79,6 +81,7 @@ AS3935_I2C_ADDR = config.get("AS3935_I2C_ADDR", 3)
 AS3935_CAPACITANCE = config.get("AS3935_CAPACITANCE", 96)
 IRQ_PIN = config.get("IRQ_PIN", 7)
 WAIT_TIMEOUT = 600 # Timeout in seconds (e.g., 10 minutes)
+EVENT_SOCKET = config.get("event_socket", "/tmp/thunder.sock")
 
 # Use a threading event to signal exit
 exit_event = threading.Event()
@@ -89,6 +92,21 @@ def main_exit():
     GPIO.cleanup()
     exit_event.set()
 
+def send_event_datagram(event_data):
+    """
+    Best-effort push of the event to the control server's Unix socket, a
+    single sendto instead of the print -> pipe -> reader-thread round trip.
+    The JSON line on stdout remains as fallback transport and diagnostics.
+    """
+    try:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            s.sendto(json.dumps(event_data).encode(), EVENT_SOCKET)
+        finally:
+            s.close()
+    except OSError:
+        pass # Server not listening; the stdout line still delivers
+
 def callback_handle(channel):
   """
   This function is called by the GPIO interrupt.
@@ -96,8 +114,7 @@ def callback_handle(channel):
   prints JSON data to stdout and signals the main thread to exit.
   """
   global sensor
-  time.sleep(0.005) # Debounce
-  
+
   try:
     intSrc = sensor.get_interrupt_src()
   except Exception as e:
@@ -113,9 +130,11 @@ def callback_handle(channel):
         "distance_km": distance_km,
         "intensity": intensity
     }
-    # Print JSON to stdout for the parent process (the control_server)
+    # Deliver the event over the Unix socket, plus JSON on stdout for the
+    # parent process (the control_server) as fallback
+    send_event_datagram(event_data)
     print(json.dumps(event_data), flush=True)
-    
+
     logger.info(f"Lightning detected! Distance: {distance_km}km, Intensity: {intensity}")
     main_exit() # Signal to exit successfully
     
@@ -125,6 +144,58 @@ def callback_handle(channel):
   elif intSrc == 3: # Noise
     logger.warning('Noise level too high!')
 
+# BOARD pin -> BCM number for the GPIO-capable pins of the 40-pin header.
+# The sysfs GPIO interface is addressed by BCM number, while IRQ_PIN in the
+# config follows the BOARD numbering RPi.GPIO is set up with.
+_BOARD_TO_BCM = {
+    3: 2, 5: 3, 7: 4, 8: 14, 10: 15, 11: 17, 12: 18, 13: 27, 15: 22,
+    16: 23, 18: 24, 19: 10, 21: 9, 22: 25, 23: 11, 24: 8, 26: 7, 29: 5,
+    31: 6, 32: 12, 33: 13, 35: 19, 36: 16, 37: 26, 38: 20, 40: 21,
+}
+
+def sysfs_event_loop():
+    """
+    Waits for rising edges on the IRQ pin via the sysfs GPIO interface and
+    poll(POLLPRI), dispatching each edge to callback_handle. This skips
+    RPi.GPIO's kernel-thread-to-Python-callback hop and its ms-scale
+    latency. Returns True if it ran the wait (event or timeout), False if
+    sysfs GPIO is unusable so the caller can fall back to RPi.GPIO.
+    """
+    bcm_pin = _BOARD_TO_BCM.get(IRQ_PIN)
+    if bcm_pin is None or not os.path.isdir('/sys/class/gpio'):
+        return False
+
+    gpio_dir = f"/sys/class/gpio/gpio{bcm_pin}"
+    try:
+        if not os.path.isdir(gpio_dir):
+            with open('/sys/class/gpio/export', 'w') as f:
+                f.write(str(bcm_pin))
+            time.sleep(0.1) # Give udev a moment to set permissions
+        with open(os.path.join(gpio_dir, 'direction'), 'w') as f:
+            f.write('in')
+        with open(os.path.join(gpio_dir, 'edge'), 'w') as f:
+            f.write('rising')
+
+        with open(os.path.join(gpio_dir, 'value'), 'r') as value_file:
+            value_file.read() # Consume the current state; poll only fires on new edges
+            poller = select.poll()
+            # sysfs GPIO edges arrive as POLLPRI, not POLLIN
+            poller.register(value_file, select.POLLPRI | select.POLLERR)
+
+            deadline = time.monotonic() + WAIT_TIMEOUT
+            while not exit_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if poller.poll(remaining * 1000):
+                    value_file.seek(0)
+                    value_file.read()
+                    callback_handle(IRQ_PIN)
+        return True
+    except OSError as e:
+        logger.warning(f"sysfs GPIO unavailable ({e}); falling back to RPi.GPIO callbacks.")
+        return False
+
 def main():
     global sensor
     
@@ -169,16 +240,19 @@ def main():
         sensor.set_watchdog_threshold(config.get("watchdog_threshold", 2))
         sensor.set_spike_rejection(config.get("spike_rejection", 2))
         
-        # Setup GPIO interrupt
-        GPIO.setup(IRQ_PIN, GPIO.IN)
-        GPIO.add_event_detect(IRQ_PIN, GPIO.RISING, callback=callback_handle)
-        
         logger.info(f"Listening for lightning... Timeout in {WAIT_TIMEOUT} seconds.")
-        
-        # Wait for the event from the callback, with a timeout
-        event_is_set = exit_event.wait(timeout=WAIT_TIMEOUT)
-        
-        if not event_is_set:
+
+        # Prefer the sysfs poll(POLLPRI) wait; fall back to RPi.GPIO's
+        # callback mechanism where sysfs GPIO isn't available. Debouncing
+        # happens at the C level via bouncetime (the AS3935's own
+        # spike_rejection setting filters at the sensor too), so the
+        # callback no longer sleeps to debounce.
+        if not sysfs_event_loop():
+            GPIO.setup(IRQ_PIN, GPIO.IN)
+            GPIO.add_event_detect(IRQ_PIN, GPIO.RISING, callback=callback_handle, bouncetime=5)
+            exit_event.wait(timeout=WAIT_TIMEOUT)
+
+        if not exit_event.is_set():
             logger.info("Timeout reached. No lightning detected.")
         
     except Exception as e:
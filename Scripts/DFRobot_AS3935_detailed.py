@@ -17,6 +17,7 @@
 import sys
 sys.path.append('../')
 import time
+import threading
 from DFRobot_AS3935_Lib import DFRobot_AS3935
 import RPi.GPIO as GPIO
 from datetime import datetime
@@ -37,8 +38,7 @@ if (sensor.reset()):
   print("init sensor sucess.")
 else:
   print("init sensor fail")
-  while True:
-    pass
+  sys.exit(1)
 #Configure sensor
 sensor.power_up()
 
@@ -80,7 +80,6 @@ sensor.set_spike_rejection(2)
 
 def callback_handle(channel):
   global sensor
-  time.sleep(0.005)
   intSrc = sensor.get_interrupt_src()
   if intSrc == 1:
     lightning_distKm = sensor.get_lightning_distKm()
@@ -98,10 +97,17 @@ def callback_handle(channel):
 #Set to input mode
 GPIO.setup(IRQ_PIN, GPIO.IN)
 #Set the interrupt pin, the interrupt function, rising along the trigger
-GPIO.add_event_detect(IRQ_PIN, GPIO.RISING, callback=callback_handle)
+#bouncetime debounces at the C level instead of sleeping in the callback
+GPIO.add_event_detect(IRQ_PIN, GPIO.RISING, callback=callback_handle, bouncetime=5)
 print("start lightning detect.")
 
-while True:
-  time.sleep(1.0)
-
+# Block on an event instead of waking once a second; the GPIO callback
+# registered above does all the work.
+stop = threading.Event()
+try:
+  stop.wait()
+except KeyboardInterrupt:
+  pass
+finally:
+  GPIO.cleanup()
 
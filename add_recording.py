@@ -1,34 +1,66 @@
 import os
+import sys
 import json
 import argparse
 from datetime import datetime
 
-# Assume these are in the same directory or adjust path
-import waveform
-import database
+# waveform and database (and their numpy/matplotlib/sqlite dependencies)
+# are imported lazily inside add_single_recording, so merely importing this
+# module stays cheap.
+
+# Paths computed once at import rather than per call.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_CONFIG_PATH = os.path.join(_HERE, 'config.json')
+
+# Parsed-config cache keyed by the file's stat, so repeated calls don't
+# re-read and re-parse config.json each time.
+_config_cache = {"mtime": None, "size": None, "data": None}
 
 def load_config():
-    """Loads the configuration from config.json."""
-    config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+    """Loads the configuration from config.json, cached on the file's mtime/size."""
+    config_path = _CONFIG_PATH
     try:
+        st = os.stat(config_path)
+        if (st.st_mtime_ns, st.st_size) == (_config_cache["mtime"], _config_cache["size"]):
+            return _config_cache["data"]
         with open(config_path, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        print(f"Error: {config_path} not found or invalid.", file=os.stderr)
+            config = json.loads(f.read())
+        _config_cache["mtime"] = st.st_mtime_ns
+        _config_cache["size"] = st.st_size
+        _config_cache["data"] = config
+        return config
+    except (OSError, json.JSONDecodeError):
+        print(f"Error: {config_path} not found or invalid.", file=sys.stderr)
         return {}
 
+# Directories already ensured in this process, so repeated adds skip even
+# the mkdir/EEXIST syscall.
+_ensured_dirs = set()
+
+def _ensure_dir(path):
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
 def add_single_recording(wav_file_path, distance_km=None, intensity=None):
+    # Deferred imports: waveform pulls in matplotlib/scipy, which cost
+    # hundreds of ms on a Pi and are only needed when actually adding.
+    import shutil
+    import waveform
+    import database
+    from concurrent.futures import ThreadPoolExecutor
+
     config = load_config()
     if not config:
-        print("Failed to load configuration. Cannot add recording.", file=os.stderr)
+        print("Failed to load configuration. Cannot add recording.", file=sys.stderr)
         return
 
-    db_path = os.path.join(os.path.dirname(__file__), config.get("database_file", "db/recordings.db"))
-    recording_dir = os.path.join(os.path.dirname(__file__), config.get("recording_directory", "recordings"))
-    waveform_dir_full_path = os.path.join(os.path.dirname(__file__), config.get("waveform_directory", "static/waveforms"))
+    db_path = os.path.join(_HERE, config.get("database_file", "db/recordings.db"))
+    recording_dir = os.path.join(_HERE, config.get("recording_directory", "recordings"))
+    waveform_dir_full_path = os.path.join(_HERE, config.get("waveform_directory", "static/waveforms"))
     
-    os.makedirs(recording_dir, exist_ok=True)
-    os.makedirs(waveform_dir_full_path, exist_ok=True)
+    _ensure_dir(recording_dir)
+    _ensure_dir(waveform_dir_full_path)
 
     # Copy the wav file to the recording directory
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -36,37 +68,43 @@ def add_single_recording(wav_file_path, distance_km=None, intensity=None):
     destination_wav_path = os.path.join(recording_dir, new_wav_filename)
     
     try:
-        import shutil
         shutil.copy(wav_file_path, destination_wav_path)
         print(f"Copied {wav_file_path} to {destination_wav_path}")
     except FileNotFoundError:
-        print(f"Error: Source WAV file not found at {wav_file_path}", file=os.stderr)
+        print(f"Error: Source WAV file not found at {wav_file_path}", file=sys.stderr)
         return
     except Exception as e:
-        print(f"Error copying WAV file: {e}", file=os.stderr)
+        print(f"Error copying WAV file: {e}", file=sys.stderr)
         return
 
     waveform_filename = f"manual_{ts}_{os.path.splitext(os.path.basename(wav_file_path))[0]}.png"
     waveform_filepath_full = os.path.join(waveform_dir_full_path, waveform_filename)
     
-    print(f"Generating waveform for {destination_wav_path}...")
-    if waveform.generate_waveform_image(destination_wav_path, waveform_filepath_full):
-        print(f"Waveform generated at {waveform_filepath_full}")
+    # Store relative path for web access
+    waveform_image_path_relative = os.path.join('waveforms', waveform_filename)
 
-        # Store relative path for web access
-        waveform_image_path_relative = os.path.join('waveforms', waveform_filename) 
+    db_metadata = {
+        'wav_filepath': destination_wav_path,
+        'waveform_image_path': waveform_image_path_relative,
+        'distance_km': distance_km,
+        'intensity': intensity,
+        'timestamp': datetime.now().isoformat()
+    }
 
-        db_metadata = {
-            'wav_filepath': destination_wav_path,
-            'waveform_image_path': waveform_image_path_relative,
-            'distance_km': distance_km,
-            'intensity': intensity,
-            'timestamp': datetime.now().isoformat()
-        }
+    # The waveform render is CPU-bound (numpy/matplotlib) and the DB insert
+    # is SD-card I/O, so overlap them instead of running back to back. The
+    # insert only needs the image's path, which is known up front.
+    print(f"Generating waveform for {destination_wav_path}...")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        waveform_future = executor.submit(
+            waveform.generate_waveform_image, destination_wav_path, waveform_filepath_full)
         database.add_recording(db_path, db_metadata)
-        print("Recording added to database.")
+    print("Recording added to database.")
+
+    if waveform_future.result():
+        print(f"Waveform generated at {waveform_filepath_full}")
     else:
-        print(f"Failed to generate waveform for {destination_wav_path}", file=os.stderr)
+        print(f"Failed to generate waveform for {destination_wav_path}", file=sys.stderr)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Add a WAV file recording and its waveform to the Thunder Capture database.")
@@ -1,14 +1,26 @@
+import io
 import os
 import json
+import socket
 import subprocess
+import tempfile
 import threading
 import time
 import sys
+import wave # Read recording duration from the WAV header
 import platform
 from flask import Flask, request, jsonify, render_template, send_from_directory
 from datetime import datetime
 import collections
-from scipy.io import wavfile # Import wavfile to read duration
+
+# orjson parses a few times faster than stdlib json; fall back silently
+# when the optional dependency isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
 # Custom module imports
 import database
@@ -16,51 +28,247 @@ import waveform
 
 app = Flask(__name__)
 
+# Serialize jsonify responses with orjson when available: it encodes
+# straight to bytes in C, which matters for /api/recordings (a long list
+# of row dicts) and the log endpoints (hundreds of strings). Requires the
+# provider API added in Flask 2.2; on older Flask the default encoder is
+# kept.
+if orjson is not None:
+    try:
+        from flask.json.provider import JSONProvider
+    except ImportError:
+        JSONProvider = None
+    if JSONProvider is not None:
+        class OrjsonProvider(JSONProvider):
+            def dumps(self, obj, **kwargs):
+                return orjson.dumps(obj).decode()
+
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+
+        app.json = OrjsonProvider(app)
+
 # --- Configuration and Global State ---
 CONFIG_FILE = 'config.json'
+# Paths computed once at import rather than per call (also makes them
+# independent of the working directory the server was launched from).
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_CONFIG_PATH = os.path.join(_HERE, CONFIG_FILE)
 IS_RASPBERRY_PI = platform.system() == 'Linux'
 
 # System State
 SYSTEM_STATE = "IDLE" # Possible states: IDLE, LISTENING, RECORDING, PROCESSING, ERROR
 recorder_thread = None
+detector_process = None # The running detector subprocess, if any
 stop_event = threading.Event()
 state_lock = threading.Lock()
+# Set for as long as the lifecycle thread runs; /api/status polls read this
+# flag instead of poking Thread.is_alive() through the state lock.
+_running_event = threading.Event()
 
-# In-memory log caches
+# Serializes writes to the shared write-through log file (both the stdout
+# and stderr drain threads append to it)
 log_lock = threading.Lock()
-server_log_cache = collections.deque(maxlen=200)
-capture_log_cache = collections.deque(maxlen=500) # Larger cache for potentially verbose capture logs
+
+class LogCache:
+    """
+    Bounded in-memory log cache where each line carries a monotonically
+    increasing sequence number. Pollers remember the last sequence they saw
+    and pass it back as ?since=, so each poll returns only the new lines
+    instead of re-serializing the whole window every second.
+
+    Backed by a list of slots allocated once and overwritten in place, so
+    steady-state logging reuses the same storage instead of churning deque
+    nodes - on a daemon that logs for weeks, that allocator traffic adds
+    up. Cached lines always have consecutive sequence numbers, so only the
+    sequence of the oldest slot is tracked, not one per line.
+    """
+    def __init__(self, maxlen):
+        self._buf = [None] * maxlen
+        self._capacity = maxlen
+        self._head = 0 # Slot index of the oldest cached line
+        self._count = 0
+        self._lock = threading.Lock()
+        self._next_seq = 1
+        self._first_seq = 1 # Sequence number of the oldest cached line
+        self._floor = 0 # Sequences at or below this were cleared, not evicted
+
+    def _slice(self, start):
+        """Cached lines from logical position start (0 = oldest), in order."""
+        return [self._buf[(self._head + k) % self._capacity]
+                for k in range(start, self._count)]
+
+    def append(self, line):
+        with self._lock:
+            self._buf[(self._head + self._count) % self._capacity] = line
+            if self._count < self._capacity:
+                self._count += 1
+            else:
+                # Full: the slot just written was the oldest one
+                self._head = (self._head + 1) % self._capacity
+                self._first_seq += 1
+            self._next_seq += 1
+
+    def clear(self):
+        with self._lock:
+            self._count = 0
+            self._head = 0
+            self._first_seq = self._next_seq
+            self._floor = self._next_seq - 1
+
+    def seed(self, lines):
+        """
+        Prepends historical lines (a log file's tail, at startup). They get
+        sequence numbers below anything already cached, so ordering and
+        ?since= filtering stay consistent with lines printed during import.
+        """
+        with self._lock:
+            room = self._capacity - self._count
+            lines = lines[-room:] if room else []
+            for offset, line in enumerate(reversed(lines), start=1):
+                self._buf[(self._head - offset) % self._capacity] = line
+            self._head = (self._head - len(lines)) % self._capacity
+            self._count += len(lines)
+            self._first_seq -= len(lines)
+
+    def snapshot(self, since=None):
+        """
+        Returns (lines, newest sequence number, partial). partial is True
+        when lines is a contiguous delta the caller can append to what it
+        already has; otherwise (no since, lines evicted, or the cache was
+        cleared) the full window is returned and should replace it.
+        """
+        with self._lock:
+            last_seq = self._next_seq - 1
+            if since is not None and since >= self._floor \
+                    and since >= self._first_seq - 1:
+                return self._slice(max(0, since - self._first_seq + 1)), last_seq, True
+            return self._slice(0), last_seq, False
+
+server_log_cache = LogCache(maxlen=200)
+capture_log_cache = LogCache(maxlen=500) # Larger cache for potentially verbose capture logs
+
+# Detector event IPC: the detector sends one JSON datagram per lightning
+# event to this Unix socket, a single sendto instead of the
+# print -> pipe -> reader round trip. Its stdout JSON line stays as the
+# fallback transport.
+_detector_events = collections.deque()
 
 # --- Logging Setup ---
 
+# The log caches are memory-only, so a restart would lose all server log
+# history. Server log lines are written through to this file (one
+# line-buffered fd for the process lifetime, not an open per write) and the
+# cache is re-seeded from its tail at startup.
+_SERVER_LOG_PATH = os.path.join(_HERE, 'server.log')
+try:
+    _server_log_file = open(_SERVER_LOG_PATH, 'a', buffering=1)
+except OSError:
+    _server_log_file = None
+
 class StreamToLogger:
     """
     A file-like object that redirects a stream (like stdout or stderr)
-    to both the original stream and a thread-safe in-memory deque.
+    to the original stream, a thread-safe in-memory LogCache, and
+    optionally a write-through log file for persistence. The actual I/O
+    happens on a background drain thread, so threads that log (the Flask
+    workers and the recorder lifecycle) never block on the console, the
+    log file, or the cache lock.
     """
-    def __init__(self, original_stream, log_deque, lock):
+    def __init__(self, original_stream, log_cache, log_file=None):
         self.original_stream = original_stream
-        self.log_deque = log_deque
-        self.lock = lock
+        self.log_cache = log_cache
+        self.log_file = log_file
+        self._fragments = [] # Partial line accumulated across writes (drain side)
+        # deque.append is atomic in CPython, so producers need no lock here
+        self._queue = collections.deque()
+        self._wakeup = threading.Event()
+        threading.Thread(target=self._drain, daemon=True).start()
 
     def write(self, buf):
-        # Write to the original stream
-        self.original_stream.write(buf)
-        self.original_stream.flush()
-        # Append to our in-memory cache
-        with self.lock:
-            self.log_deque.append(buf)
+        self._queue.append(buf)
+        self._wakeup.set()
+
+    def _drain(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                buf = self._queue.popleft()
+                self.original_stream.write(buf)
+                # Collect fragments and take the cache lock only once a
+                # full line is available.
+                self._fragments.append(buf)
+                if '\n' in buf:
+                    line = ''.join(self._fragments)
+                    self._fragments = []
+                    self.log_cache.append(line)
+                    if self.log_file is not None:
+                        with log_lock:
+                            self.log_file.write(line)
 
     def flush(self):
         self.original_stream.flush()
 
 # Redirect stdout and stderr to the server log cache
-sys.stdout = StreamToLogger(sys.stdout, server_log_cache, log_lock)
-sys.stderr = StreamToLogger(sys.stderr, server_log_cache, log_lock)
+sys.stdout = StreamToLogger(sys.stdout, server_log_cache, _server_log_file)
+sys.stderr = StreamToLogger(sys.stderr, server_log_cache, _server_log_file)
 
 
 # --- Helper Functions ---
 
+def tail_file(path, max_lines=100, window=16384):
+    """
+    Returns the last max_lines lines of a file (newlines kept) without
+    reading the whole thing: seek back a bounded window from the end,
+    doubling it if it doesn't span enough newlines.
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            while True:
+                f.seek(max(0, size - window))
+                data = f.read()
+                if data.count(b'\n') >= max_lines or window >= size:
+                    break
+                window *= 2
+        return data.decode(errors='replace').splitlines(keepends=True)[-max_lines:]
+    except OSError:
+        return []
+
+def _event_socket_reader(sock):
+    """Receives detector event datagrams and queues them for the lifecycle."""
+    while True:
+        try:
+            data = sock.recv(65536)
+        except OSError:
+            break
+        line = data.decode(errors='replace')
+        capture_log_cache.append(line + '\n')
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        _detector_events.append(event)
+
+def start_event_socket(path):
+    """
+    Binds the detector event socket and starts its reader thread. If the
+    socket can't be bound the lifecycle still works off the detector's
+    stdout, so failure here is only a warning.
+    """
+    try:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+    except OSError as e:
+        print(f"Warning: could not bind event socket {path}: {e}", file=sys.stderr)
+        return
+    threading.Thread(target=_event_socket_reader, args=(sock,), daemon=True).start()
+
 def set_system_state(new_state):
     """Thread-safe function to update the system state."""
     global SYSTEM_STATE
@@ -68,23 +276,49 @@ def set_system_state(new_state):
         SYSTEM_STATE = new_state
     print(f"System state changed to: {SYSTEM_STATE}")
 
+# Cache for the parsed config, keyed by the file's stat. The status/config
+# endpoints are polled by the web UI, so without this every poll re-reads and
+# re-parses config.json from the SD card.
+_config_cache = {"mtime": None, "size": None, "data": None, "raw": None}
+
 def load_config():
-    """Loads the configuration from config.json."""
+    """Loads the configuration from config.json, cached on the file's mtime/size."""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-            if "is_indoor" not in config:
-                config["is_indoor"] = False # Default to outdoor
-            return config
-    except (FileNotFoundError, json.JSONDecodeError):
+        st = os.stat(_CONFIG_PATH)
+        if (st.st_mtime_ns, st.st_size) == (_config_cache["mtime"], _config_cache["size"]):
+            return _config_cache["data"]
+        with open(_CONFIG_PATH, 'rb') as f:
+            raw = f.read()
+        config = _json_loads(raw)
+        if "is_indoor" not in config:
+            config["is_indoor"] = False # Default to outdoor
+        _config_cache["mtime"] = st.st_mtime_ns
+        _config_cache["size"] = st.st_size
+        _config_cache["data"] = config
+        _config_cache["raw"] = raw
+        return config
+    except (OSError, json.JSONDecodeError):
         print(f"Warning: {CONFIG_FILE} not found or invalid. Using default config.", file=sys.stderr)
         return {"is_indoor": False} # Return a default config if file is missing or invalid
 
 def save_config(data):
-    """Saves the provided dictionary to config.json."""
+    """
+    Saves the provided dictionary to config.json. No-op POSTs (payload
+    identical to what's on disk) skip the write entirely to spare the SD
+    card, and real writes go through a temp file + os.replace so a crash
+    mid-write can't leave a truncated config.
+    """
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        new_bytes = json.dumps(data, indent=4).encode()
+        load_config() # Make sure the cache reflects what's on disk
+        if new_bytes == _config_cache["raw"]:
+            return True
+        tmp_path = _CONFIG_PATH + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(new_bytes)
+        os.replace(tmp_path, _CONFIG_PATH)
+        # Invalidate so the next load_config re-stats and re-parses
+        _config_cache["mtime"] = None
         return True
     except IOError as e:
         print(f"Error saving configuration to {CONFIG_FILE}: {e}", file=sys.stderr)
@@ -97,148 +331,171 @@ def recorder_lifecycle(config, stop_event_flag):
     The main background thread that manages the detection, recording,
     and processing lifecycle.
     """
+    global detector_process
     db_path = config.get("database_file", "db/recordings.db")
     
-    while not stop_event_flag.is_set():
-        # --- 1. LISTENING State ---
-        set_system_state("LISTENING")
-        lightning_data = None
+    _running_event.set()
+    try:
+        while not stop_event_flag.is_set():
+            # --- 1. LISTENING State ---
+            set_system_state("LISTENING")
+            lightning_data = None
         
-        # Clear capture log before starting
-        with log_lock:
+            # Clear capture log and any stale detector events before starting
             capture_log_cache.clear()
+            _detector_events.clear()
 
-        if IS_RASPBERRY_PI:
-            script_path = os.path.join(os.path.dirname(__file__), config.get("thunder_recorder_script"))
-            detector_command = ['python3', '-u', script_path]
-            if config.get("is_indoor", False): # Pass --indoor flag if configured
-                detector_command.append('--indoor')
+            if IS_RASPBERRY_PI:
+                script_path = os.path.join(_HERE, config.get("thunder_recorder_script"))
+                detector_command = ['python3', '-u', script_path]
+                if config.get("is_indoor", False): # Pass --indoor flag if configured
+                    detector_command.append('--indoor')
 
-            try:
-                # Use line-buffering (bufsize=1) and text mode
-                detector_process = subprocess.Popen(
-                    detector_command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT, # Redirect stderr to stdout
-                    text=True,
-                    bufsize=1 
-                )
-                
-                # Stream output line by line
-                for line in iter(detector_process.stdout.readline, ''):
-                    if stop_event_flag.is_set():
-                        detector_process.terminate() # Stop the script if stop is signaled
-                        break
+                try:
+                    # A 64K binary pipe batches reads from a chatty child into
+                    # few syscalls; lines are split on our side by the text
+                    # wrapper. The child runs with -u so its output still
+                    # arrives promptly.
+                    detector_process = subprocess.Popen(
+                        detector_command,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT, # Redirect stderr to stdout
+                        bufsize=65536
+                    )
+                    detector_stdout = io.TextIOWrapper(
+                        detector_process.stdout, encoding='utf-8', errors='replace')
+
+                    # Stream output line by line
+                    for line in iter(detector_stdout.readline, ''):
+                        if stop_event_flag.is_set():
+                            detector_process.terminate() # Stop the script if stop is signaled
+                            break
                     
-                    # Log to both capture log and main server log
-                    with log_lock:
+                        # Log to both capture log and main server log
                         capture_log_cache.append(line)
-                    print(f"[Detector] {line.strip()}") # Also log to main server log for context
-
-                    # Check for the specific JSON output indicating detection
-                    try:
-                        # The script should ONLY output JSON upon successful detection
-                        potential_json = json.loads(line)
-                        if potential_json.get("event") == "lightning":
-                            lightning_data = potential_json
-                            break # Exit the loop to proceed with recording
-                    except json.JSONDecodeError:
-                        continue # Not a JSON line, just a regular log, so continue listening
+                        print(f"[Detector] {line.strip()}") # Also log to main server log for context
+
+                        # Check for the specific JSON output indicating detection.
+                        # Ordinary log lines never start with '{', so test the
+                        # first byte before paying for a parse attempt (and the
+                        # exception it would raise) on every line.
+                        stripped = line.strip()
+                        if stripped.startswith('{') and stripped.endswith('}'):
+                            try:
+                                # The script should ONLY output JSON upon successful detection
+                                potential_json = _json_loads(stripped)
+                            except ValueError:
+                                continue # Malformed line, keep listening
+                            if potential_json.get("event") == "lightning":
+                                lightning_data = potential_json
+                                break # Exit the loop to proceed with recording
                 
-                detector_process.stdout.close()
-                return_code = detector_process.wait()
+                    detector_stdout.close()
+                    return_code = detector_process.wait()
+                    detector_process = None
 
-                if return_code != 0 and not lightning_data:
-                    print(f"Detector script exited with non-zero code: {return_code}", file=sys.stderr)
+                    # Prefer the event delivered over the Unix socket; the JSON
+                    # line parsed from stdout above is the fallback transport.
+                    if _detector_events:
+                        lightning_data = _detector_events.popleft()
 
-            except Exception as e:
-                print(f"Error running detector script: {e}", file=sys.stderr)
-        else:
-            # --- SIMULATION for local testing ---
-            print("SIMULATION: Simulating lightning detection...")
-            with log_lock:
+                    if return_code != 0 and not lightning_data:
+                        print(f"Detector script exited with non-zero code: {return_code}", file=sys.stderr)
+
+                except Exception as e:
+                    print(f"Error running detector script: {e}", file=sys.stderr)
+            else:
+                # --- SIMULATION for local testing ---
+                print("SIMULATION: Simulating lightning detection...")
                 capture_log_cache.append("SIMULATOR: Listening for thunder...\n")
-            time.sleep(15) # Wait for 15 seconds to simulate listening
-            if stop_event_flag.is_set(): break
-            # Fake a lightning event
-            lightning_data = {"event": "lightning", "distance_km": 10, "intensity": 5000}
-            sim_log = f"SIMULATOR: Detected lightning! Data: {json.dumps(lightning_data)}\n"
-            print(f"SIMULATION: {lightning_data}")
-            with log_lock:
+                time.sleep(15) # Wait for 15 seconds to simulate listening
+                if stop_event_flag.is_set(): break
+                # Fake a lightning event
+                lightning_data = {"event": "lightning", "distance_km": 10, "intensity": 5000}
+                sim_log = f"SIMULATOR: Detected lightning! Data: {json.dumps(lightning_data)}\n"
+                print(f"SIMULATION: {lightning_data}")
                 capture_log_cache.append(sim_log)
 
-        # --- 2. RECORDING State ---
-        if lightning_data and lightning_data.get("event") == "lightning":
-            set_system_state("RECORDING")
+            # --- 2. RECORDING State ---
+            if lightning_data and lightning_data.get("event") == "lightning":
+                set_system_state("RECORDING")
             
-            # Create unique filenames
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            wav_filename = f"thunder_{ts}.wav"
-            waveform_filename = f"thunder_{ts}.png"
-
-            # Define paths from config
-            recording_dir = config.get("recording_directory", "recordings")
-            waveform_dir = config.get("waveform_directory", "static/waveforms")
+                # Create unique filenames
+                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+                wav_filename = f"thunder_{ts}.wav"
+                waveform_filename = f"thunder_{ts}.png"
+
+                # Define paths from config
+                recording_dir = config.get("recording_directory", "recordings")
+                waveform_dir = config.get("waveform_directory", "static/waveforms")
             
-            # Create absolute paths
-            wav_filepath = os.path.join(recording_dir, wav_filename)
-            waveform_filepath = os.path.join(waveform_dir, waveform_filename)
-
-            # Ensure directories exist
-            os.makedirs(recording_dir, exist_ok=True)
-            os.makedirs(waveform_dir, exist_ok=True)
+                # Create absolute paths
+                wav_filepath = os.path.join(recording_dir, wav_filename)
+                waveform_filepath = os.path.join(waveform_dir, waveform_filename)
 
-            recording_duration = config.get("RECORDING_LENGTH", 15)
-            actual_wav_duration = 0.0 # Initialize actual duration
+                # Ensure directories exist
+                os.makedirs(recording_dir, exist_ok=True)
+                os.makedirs(waveform_dir, exist_ok=True)
 
-            if IS_RASPBERRY_PI:
-                try:
-                    device = config.get("DEVICE", "plughw:1,0")
-                    # Note: arecord format might need to be configurable
-                    arecord_cmd = ['arecord', '-D', device, '-f', 'cd', '-d', str(recording_duration), wav_filepath]
-                    print(f"Executing: {' '.join(arecord_cmd)}")
-                    subprocess.run(arecord_cmd, check=True)
-                    # Get actual duration after recording
-                    if os.path.exists(wav_filepath):
-                        samplerate, data = wavfile.read(wav_filepath)
-                        actual_wav_duration = len(data) / samplerate
+                recording_duration = config.get("RECORDING_LENGTH", 15)
+                actual_wav_duration = 0.0 # Initialize actual duration
 
-                except Exception as e:
-                    print(f"Error during recording: {e}", file=sys.stderr)
-                    set_system_state("ERROR")
-                    time.sleep(5)
-                    continue # Skip to next listening cycle
-            else:
-                print(f"SIMULATION: Faking recording for {recording_duration}s to {wav_filepath}")
-                time.sleep(2) # Simulate recording time
-                # Create a dummy empty wav file for the simulation
-                with open(wav_filepath, 'w') as f: f.write("dummy")
-                actual_wav_duration = recording_duration # In simulation, assume recorded length is config length
-
-
-            # --- 3. PROCESSING State ---
-            set_system_state("PROCESSING")
-            print("Generating waveform...")
+                if IS_RASPBERRY_PI:
+                    try:
+                        device = config.get("DEVICE", "plughw:1,0")
+                        # Note: arecord format might need to be configurable
+                        arecord_cmd = ['arecord', '-D', device, '-f', 'cd', '-d', str(recording_duration), wav_filepath]
+                        print(f"Executing: {' '.join(arecord_cmd)}")
+                        # Drop arecord's progress chatter in the kernel rather
+                        # than letting it interleave with the server console;
+                        # a failure still raises via check=True.
+                        subprocess.run(arecord_cmd, check=True,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                        # Get actual duration after recording. Only the header
+                        # is needed for this; scipy's wavfile.read decoded the
+                        # whole multi-MB file into an array just to take len().
+                        if os.path.exists(wav_filepath):
+                            with wave.open(wav_filepath, 'rb') as wav_file:
+                                actual_wav_duration = wav_file.getnframes() / wav_file.getframerate()
+
+                    except Exception as e:
+                        print(f"Error during recording: {e}", file=sys.stderr)
+                        set_system_state("ERROR")
+                        time.sleep(5)
+                        continue # Skip to next listening cycle
+                else:
+                    print(f"SIMULATION: Faking recording for {recording_duration}s to {wav_filepath}")
+                    time.sleep(2) # Simulate recording time
+                    # Create a dummy empty wav file for the simulation
+                    with open(wav_filepath, 'w') as f: f.write("dummy")
+                    actual_wav_duration = recording_duration # In simulation, assume recorded length is config length
+
+
+                # --- 3. PROCESSING State ---
+                set_system_state("PROCESSING")
+                print("Generating waveform...")
             
-            # Generate waveform (this will fail in simulation if scipy can't read the dummy file)
-            # We'll add a check in the waveform generator to handle this
-            waveform.generate_waveform_image(wav_filepath, waveform_filepath)
-
-            print("Adding record to database...")
-            db_metadata = {
-                'wav_filepath': wav_filepath,
-                'waveform_image_path': os.path.join('waveforms', waveform_filename), # Store relative path for web
-                'distance_km': lightning_data.get("distance_km"),
-                'intensity': lightning_data.get("intensity"),
-                'duration_seconds': actual_wav_duration # Add duration
-            }
-            database.add_recording(db_path, db_metadata)
+                # Generate waveform (this will fail in simulation if scipy can't read the dummy file)
+                # We'll add a check in the waveform generator to handle this
+                waveform.generate_waveform_image(wav_filepath, waveform_filepath)
+
+                print("Adding record to database...")
+                db_metadata = {
+                    'wav_filepath': wav_filepath,
+                    'waveform_image_path': os.path.join('waveforms', waveform_filename), # Store relative path for web
+                    'distance_km': lightning_data.get("distance_km"),
+                    'intensity': lightning_data.get("intensity"),
+                    'duration_seconds': actual_wav_duration # Add duration
+                }
+                database.add_recording(db_path, db_metadata)
         
-        if stop_event_flag.is_set():
-            break
+            if stop_event_flag.is_set():
+                break
             
-    set_system_state("IDLE")
-    print("Recorder lifecycle thread has stopped.")
+    finally:
+        _running_event.clear()
+        set_system_state("IDLE")
+        print("Recorder lifecycle thread has stopped.")
 
 # --- Control Functions ---
 
@@ -251,9 +508,20 @@ def start_recorder():
         config = load_config()
         stop_event.clear()
         recorder_thread = threading.Thread(target=recorder_lifecycle, args=(config, stop_event), daemon=True)
+        # Set before start() so a status poll racing the spawn sees "running";
+        # the lifecycle clears it in its finally block.
+        _running_event.set()
         recorder_thread.start()
         return True
 
+def is_recorder_running():
+    """
+    Reports whether the lifecycle thread is running. Reading the event flag
+    is a single atomic check, so status polls from N clients don't take the
+    state lock or touch thread internals at all.
+    """
+    return _running_event.is_set()
+
 def stop_recorder():
     global recorder_thread, stop_event
     with state_lock:
@@ -262,10 +530,29 @@ def stop_recorder():
             
         print("Signaling recorder thread to stop...")
         stop_event.set()
+        # The lifecycle thread may be blocked reading the stdout of a quiet
+        # detector (for up to the detector's own 10-minute timeout), so
+        # terminate the child: the pipe hits EOF and the thread notices the
+        # stop immediately. A timer SIGKILLs it if SIGTERM is ignored.
+        proc = detector_process
+        if proc is not None:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+            threading.Timer(10, _force_kill, args=(proc,)).start()
         # The thread will stop on its own time, we don't block here with join()
         # to keep the UI responsive.
         return True
 
+def _force_kill(proc):
+    """SIGKILL backstop for a detector that ignored SIGTERM."""
+    if proc.poll() is None:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
 # --- Flask Routes ---
 
 @app.route('/')
@@ -294,7 +581,7 @@ def handle_config():
 def get_status():
     status = {
         "system_state": SYSTEM_STATE,
-        "is_running": recorder_thread.is_alive() if recorder_thread else False
+        "is_running": is_recorder_running()
     }
     return jsonify(status)
     
@@ -302,22 +589,25 @@ def get_status():
 def get_recordings():
     config = load_config()
     db_path = config.get("database_file", "db/recordings.db")
-    all_recordings = database.get_all_recordings(db_path)
+    # Optional paging so the UI doesn't have to pull every row each poll
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    all_recordings = database.get_all_recordings(db_path, limit=limit, offset=offset)
     return jsonify(all_recordings)
 
 @app.route('/api/server_logs')
 def get_server_logs():
-    with log_lock:
-        # Create a snapshot of the current logs
-        logs = list(server_log_cache)
-    return jsonify({"logs": logs})
+    # Without ?since= the full window is returned; with it, only lines the
+    # poller hasn't seen. last_seq is what the client passes back next time.
+    since = request.args.get('since', type=int)
+    logs, last_seq, partial = server_log_cache.snapshot(since)
+    return jsonify({"logs": logs, "last_seq": last_seq, "partial": partial})
 
 @app.route('/api/capture_logs')
 def get_capture_logs():
-    with log_lock:
-        # Create a snapshot of the current logs
-        logs = list(capture_log_cache)
-    return jsonify({"logs": logs})
+    since = request.args.get('since', type=int)
+    logs, last_seq, partial = capture_log_cache.snapshot(since)
+    return jsonify({"logs": logs, "last_seq": last_seq, "partial": partial})
 
 @app.route('/api/start_recorder', methods=['POST'])
 def api_start_recorder():
@@ -335,12 +625,23 @@ def api_stop_recorder():
 @app.route('/api/git_sync', methods=['POST'])
 def api_git_sync():
     try:
-        git_dir = os.path.dirname(__file__)
+        git_dir = _HERE
         if not os.path.isdir(os.path.join(git_dir, '.git')):
             return jsonify({"status": "error", "message": "Not a Git repository."}), 400
-        git_process = subprocess.Popen(['git', 'pull'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=git_dir)
-        stdout, _ = git_process.communicate()
-        if git_process.returncode == 0:
+        # Stream git's output to a temp file rather than buffering it all in
+        # memory via communicate(); only the tail is needed for the response.
+        with tempfile.TemporaryFile() as tf:
+            git_process = subprocess.Popen(['git', 'pull'], stdout=tf, stderr=subprocess.STDOUT, cwd=git_dir)
+            try:
+                return_code = git_process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                git_process.kill()
+                git_process.wait()
+                return jsonify({"status": "error", "message": "Git pull timed out."}), 500
+            # The child shares the file offset, so tell() is the output size
+            tf.seek(max(0, tf.tell() - 8192))
+            stdout = tf.read().decode(errors='replace')
+        if return_code == 0:
             return jsonify({"status": "success", "message": "Repository updated successfully.", "output": stdout}), 200
         else:
             return jsonify({"status": "error", "message": "Git pull failed.", "output": stdout}), 500
@@ -348,9 +649,37 @@ def api_git_sync():
         return jsonify({"status": "error", "message": f"An error occurred: {str(e)}"}), 500
 
 if __name__ == '__main__':
+    # Seed the server log cache from the persisted log's tail so the UI has
+    # history from before this restart (prepended, in case anything printed
+    # during import).
+    server_log_cache.seed(tail_file(_SERVER_LOG_PATH))
+
     # Initialize DB on startup
     app_config = load_config()
     db_path = app_config.get("database_file", "db/recordings.db")
     database.init_db(db_path)
-    
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Fill in durations for rows that predate the duration_seconds column
+    # (header reads only, one transaction; a no-op once everything is set).
+    database.backfill_durations(db_path)
+
+    # Seed the capture log cache with the tail of the detector's log so the
+    # UI shows recent history after a restart, without reading the whole file.
+    detector_log = os.path.join(_HERE, app_config.get("log_file", "thunder_recorder.log"))
+    capture_log_cache.seed(tail_file(detector_log))
+
+    # Listen for detector event datagrams (Linux only; the simulation path
+    # doesn't use the socket).
+    if IS_RASPBERRY_PI:
+        start_event_socket(app_config.get("event_socket", "/tmp/thunder.sock"))
+
+    if os.environ.get("FLASK_DEV"):
+        # Dev server. Reloader stays off either way: a source change would
+        # restart the process and kill the recorder thread mid-recording.
+        app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+    else:
+        # Werkzeug's dev server handles one request at a time, so the UI's
+        # 1 Hz status/log polls would queue behind each other. Serve with
+        # waitress instead — threads in a single process, since the recorder
+        # state lives in module globals.
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5001, threads=8)
@@ -1,20 +1,45 @@
 import sqlite3
 import os
+import wave
+
+# One connection per database path, reused across calls. Opening a fresh
+# connection per operation re-parses the schema and re-warms the page cache
+# every time; with WAL journaling a long-lived shared connection is safe.
+_CONN_CACHE = {}
+
+# Bump when init_db's schema changes; databases already at this version
+# skip table creation and the column-migration probe entirely.
+_SCHEMA_VERSION = 2
 
 def get_db_connection(db_path):
-    """Creates a database connection."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row # This allows accessing columns by name
+    """Returns a cached database connection, creating it on first use."""
+    conn = _CONN_CACHE.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row # This allows accessing columns by name
+        # WAL + synchronous=NORMAL: commits append to the write-ahead log
+        # instead of each forcing a full database flush - a large win for
+        # batched inserts on SD-card storage.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _CONN_CACHE[db_path] = conn
     return conn
 
 def init_db(db_path):
     """Initializes the database and creates the recordings table if it doesn't exist."""
     db_dir = os.path.dirname(db_path)
-    if db_dir and not os.path.exists(db_dir):
-        os.makedirs(db_dir)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
         
     conn = get_db_connection(db_path)
     cursor = conn.cursor()
+    # user_version records which schema this file already has; once it says
+    # the current version, startup is this one PRAGMA read instead of the
+    # CREATE/index/table_info probe below.
+    schema_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    if schema_version >= _SCHEMA_VERSION:
+        return
+
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS recordings (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -26,6 +51,9 @@ def init_db(db_path):
             duration_seconds REAL
         )
     ''')
+    # get_all_recordings orders by timestamp; without this index SQLite
+    # re-sorts the whole table on every /api/recordings call.
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_recordings_ts ON recordings(timestamp DESC)')
     # Add duration_seconds column if it doesn't exist (for existing databases)
     cursor.execute('''
         PRAGMA table_info(recordings);
@@ -35,8 +63,7 @@ def init_db(db_path):
         cursor.execute('''
             ALTER TABLE recordings ADD COLUMN duration_seconds REAL;
         ''')
-    conn.commit()
-    conn.close()
+    cursor.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
     print(f"Database initialized at {db_path}")
 
 def add_recording(db_path, metadata):
@@ -54,36 +81,117 @@ def add_recording(db_path, metadata):
                 metadata.get('duration_seconds')
             )
         )
-        conn.commit()
-        last_id = cursor.lastrowid
-        return last_id
+        return cursor.lastrowid
     except sqlite3.IntegrityError:
         print(f"Error: A recording for {metadata.get('wav_filepath')} already exists.")
         return None
-    finally:
-        conn.close()
 
-def get_all_recordings(db_path):
-    """Retrieves all recordings from the database."""
+def add_recordings_bulk(db_path, metadatas):
+    """
+    Adds many recordings' metadata in a single transaction, so a batch of N
+    inserts costs one commit (and one fsync) instead of N. Rows whose
+    wav_filepath already exists are skipped.
+    """
+    conn = get_db_connection(db_path)
+    rows = [
+        (
+            m.get('wav_filepath'),
+            m.get('waveform_image_path'),
+            m.get('distance_km'),
+            m.get('intensity'),
+            m.get('duration_seconds')
+        )
+        for m in metadatas
+    ]
+    try:
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT OR IGNORE INTO recordings (wav_filepath, waveform_image_path, distance_km, intensity, duration_seconds) VALUES (?, ?, ?, ?, ?)',
+            rows
+        )
+        conn.execute('COMMIT')
+    except sqlite3.Error:
+        conn.execute('ROLLBACK')
+        raise
+
+def backfill_durations(db_path):
+    """
+    Fills in duration_seconds for rows that predate the column. Durations
+    come from each file's WAV header (a few bytes via wave.open, no sample
+    data read) and all updates commit in one transaction, so the whole
+    backfill costs N header reads and a single fsync. Files that are
+    missing or aren't real WAVs (e.g. simulation dummies) are skipped and
+    retried on the next run.
+    """
+    conn = get_db_connection(db_path)
+    rows = conn.execute(
+        'SELECT wav_filepath FROM recordings WHERE duration_seconds IS NULL'
+    ).fetchall()
+    if not rows:
+        return 0
+
+    updates = []
+    for row in rows:
+        path = row['wav_filepath']
+        try:
+            with wave.open(path, 'rb') as wf:
+                duration = wf.getnframes() / float(wf.getframerate())
+        except (OSError, EOFError, wave.Error, ZeroDivisionError):
+            continue
+        updates.append((duration, path))
+
+    if updates:
+        try:
+            conn.execute('BEGIN')
+            conn.executemany(
+                'UPDATE recordings SET duration_seconds = ? WHERE wav_filepath = ?',
+                updates
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        print(f"Backfilled duration for {len(updates)} of {len(rows)} recordings.")
+    return len(updates)
+
+def get_all_recordings(db_path, limit=None, offset=0):
+    """
+    Retrieves recordings from the database, newest first. Pass limit/offset
+    to page through them instead of pulling every row.
+    """
     if not os.path.exists(db_path):
         return []
-        
+
     conn = get_db_connection(db_path)
     cursor = conn.cursor()
-    cursor.execute('SELECT id, timestamp, wav_filepath, waveform_image_path, distance_km, intensity, duration_seconds FROM recordings ORDER BY timestamp DESC')
+    query = 'SELECT id, timestamp, wav_filepath, waveform_image_path, distance_km, intensity, duration_seconds FROM recordings ORDER BY timestamp DESC'
+    params = ()
+    if limit is not None:
+        query += ' LIMIT ? OFFSET ?'
+        params = (limit, offset)
+    cursor.execute(query, params)
     recordings = cursor.fetchall()
-    conn.close()
     # Convert list of Row objects to list of dicts for JSON serialization
     return [dict(row) for row in recordings]
 
 def delete_recordings_by_path_pattern(db_path, pattern):
     """Deletes recordings from the database where wav_filepath matches the given pattern."""
+    return delete_recordings_by_patterns(db_path, [pattern])
+
+def delete_recordings_by_patterns(db_path, patterns):
+    """
+    Deletes recordings whose wav_filepath matches any of the given LIKE
+    patterns, in one statement (one table pass, one commit) rather than one
+    scan per pattern. Patterns with a literal prefix (not starting with %)
+    let SQLite range-scan the unique wav_filepath index.
+    """
+    if not patterns:
+        return 0
     conn = get_db_connection(db_path)
     cursor = conn.cursor()
-    cursor.execute('DELETE FROM recordings WHERE wav_filepath LIKE ?', (pattern,))
+    where = ' OR '.join(['wav_filepath LIKE ?'] * len(patterns))
+    cursor.execute(f'DELETE FROM recordings WHERE {where}', tuple(patterns))
     deleted_count = cursor.rowcount
-    conn.commit()
-    conn.close()
-    print(f"Deleted {deleted_count} recordings matching pattern: {pattern}")
+    print(f"Deleted {deleted_count} recordings matching patterns: {', '.join(patterns)}")
     return deleted_count
 
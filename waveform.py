@@ -1,9 +1,139 @@
 import os
-import matplotlib
-matplotlib.use('Agg') # Use a non-interactive backend to run on systems without a display
-import matplotlib.pyplot as plt
+import threading
+import numpy as np
 from scipy.io import wavfile
 
+# Pillow lets the flat two-color waveform be rasterized straight into a
+# pixel array and saved, skipping matplotlib's figure/Agg machinery and its
+# several-hundred-ms import. matplotlib remains the fallback renderer when
+# Pillow isn't installed.
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+    ImageDraw = None
+
+# '#007bff' — the UI accent color, same as the matplotlib path uses
+_WAVEFORM_RGBA = (0, 123, 255, 255)
+
+# Output directories already ensured in this process; the waveform
+# directory is the same for every render, so check it once.
+_ensured_dirs = set()
+
+def _ensure_dir(path):
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+def _column_minmax(data, width_px):
+    """
+    Collapses the samples into one (min, max) pair per output column. A 15 s
+    recording at 44.1 kHz is ~660k samples, almost all of which land on the
+    same pixel column; the envelope is what a dense plot would resolve to
+    anyway. Clips shorter than the column count are interpolated up.
+    """
+    n = len(data)
+    if n >= width_px * 2:
+        step = n // width_px
+        trimmed = data[:width_px * step].reshape(width_px, step)
+        return trimmed.min(axis=1), trimmed.max(axis=1)
+    # Fewer samples than columns: one interpolated value per column
+    if n < 2:
+        data = np.repeat(data, 2)
+    vals = np.interp(np.arange(width_px),
+                     np.linspace(0, width_px - 1, len(data)), data)
+    return vals, vals
+
+def _envelope(data, bins):
+    """Interleaves the per-column min/max pairs into a single polyline."""
+    mins, maxs = _column_minmax(data, bins)
+    xs = np.repeat(np.arange(bins), 2)
+    ys = np.empty(bins * 2, dtype=mins.dtype)
+    ys[0::2] = mins
+    ys[1::2] = maxs
+    return xs, ys
+
+def _render_envelope_pil(mins, maxs, output_path, width_px, height_px):
+    """
+    Rasterizes the envelope directly into an RGBA array: for each column
+    the pixels between the scaled min and max get the waveform color and
+    the rest stays transparent. No figure or canvas objects involved.
+    """
+    vmin = float(mins.min())
+    vmax = float(maxs.max())
+    span = (vmax - vmin) or 1.0
+    # Image row 0 is the top, so the value axis is flipped
+    y_top = ((vmax - maxs) * (height_px - 1) / span).astype(np.int32)
+    y_bot = ((vmax - mins) * (height_px - 1) / span).astype(np.int32)
+    rows = np.arange(height_px)[:, None]
+    mask = (rows >= y_top) & (rows <= y_bot)
+    img = np.zeros((height_px, width_px, 4), dtype=np.uint8)
+    img[mask] = _WAVEFORM_RGBA
+    Image.fromarray(img, 'RGBA').save(output_path)
+
+# Reused figure/axes for the matplotlib fallback, keyed by figure size.
+# Creating a figure (and tearing it down) dominates the render time for
+# these tiny plots; clearing the axes between calls keeps only the cheap
+# part. Guarded by a lock since renders can come from worker threads.
+_MPL_FIG_CACHE = {}
+_MPL_FIG_LOCK = threading.Lock()
+
+def _get_mpl_figure(width_px, height_px, dpi):
+    import matplotlib
+    matplotlib.use('Agg') # Use a non-interactive backend to run on systems without a display
+    import matplotlib.pyplot as plt
+
+    key = (width_px, height_px, dpi)
+    cached = _MPL_FIG_CACHE.get(key)
+    if cached is None:
+        fig, ax = plt.subplots(figsize=(width_px / dpi, height_px / dpi))
+        fig.patch.set_alpha(0)
+        _MPL_FIG_CACHE[key] = cached = (fig, ax)
+    return cached
+
+def _render_envelope_mpl(data, output_path, width_px, height_px, dpi):
+    """matplotlib fallback renderer, used when Pillow isn't available."""
+    with _MPL_FIG_LOCK:
+        fig, ax = _get_mpl_figure(width_px, height_px, dpi)
+        ax.clear()
+
+        if len(data) > width_px * 2:
+            xs, ys = _envelope(data, width_px)
+            ax.plot(xs, ys, color='#007bff', linewidth=0.5)
+            ax.set_xlim(0, width_px)
+        else:
+            # Short clip: fewer samples than columns, plot directly
+            ax.plot(data, color='#007bff', linewidth=0.5)
+            ax.set_xlim(0, len(data))
+
+        ax.axis('off')
+        ax.patch.set_alpha(0)
+        ax.set_ylim(data.min(), data.max())
+        fig.tight_layout(pad=0)
+        fig.savefig(output_path, dpi=dpi, format='png', transparent=True, pad_inches=0)
+
+def _render_placeholder_pil(output_path, width_px, height_px):
+    """Placeholder image for simulated (dummy) recordings, via Pillow."""
+    img = Image.new('RGBA', (width_px, height_px), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.text((width_px // 2, height_px // 2), 'Simulated Waveform',
+              fill=(128, 128, 128, 255), anchor='mm')
+    img.save(output_path)
+
+def _render_placeholder_mpl(output_path, width_px, height_px, dpi):
+    """Placeholder image for simulated (dummy) recordings, via matplotlib."""
+    import matplotlib
+    matplotlib.use('Agg') # Use a non-interactive backend to run on systems without a display
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(width_px / dpi, height_px / dpi))
+    ax.text(0.5, 0.5, 'Simulated Waveform', ha='center', va='center', fontsize=10, color='gray')
+    ax.axis('off')
+    fig.patch.set_alpha(0)
+    ax.patch.set_alpha(0)
+    fig.savefig(output_path, dpi=dpi, format='png', transparent=True, pad_inches=0)
+    plt.close(fig)
+
 def generate_waveform_image(wav_path, output_path, width_px=600, height_px=120, dpi=100):
     """
     Generates a waveform image from a .wav file.
@@ -12,62 +142,41 @@ def generate_waveform_image(wav_path, output_path, width_px=600, height_px=120,
     if not os.path.exists(wav_path):
         print(f"Error: WAV file not found at {wav_path}")
         return False
-        
+
     # --- Simulation Handling ---
-    try:
-        with open(wav_path, 'r') as f:
-            if f.read(5) == 'dummy':
-                print("SIMULATION: Detected dummy WAV file. Generating placeholder image.")
-                # Create a placeholder image
-                fig_width_inches = width_px / dpi
-                fig_height_inches = height_px / dpi
-                fig, ax = plt.subplots(figsize=(fig_width_inches, fig_height_inches))
-                ax.text(0.5, 0.5, 'Simulated Waveform', ha='center', va='center', fontsize=10, color='gray')
-                ax.axis('off')
-                fig.patch.set_alpha(0)
-                ax.patch.set_alpha(0)
-                
-                output_dir = os.path.dirname(output_path)
-                if not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-                
-                fig.savefig(output_path, dpi=dpi, format='png', transparent=True, pad_inches=0)
-                plt.close(fig)
-                return True
-    except Exception:
-        # This will fail on a real binary wav file, which is expected.
-        pass
+    # Read the magic bytes in binary mode: a real WAV starts with b'RIFF',
+    # so no decode attempt (and no swallowed exception) is needed to tell
+    # the two apart.
+    with open(wav_path, 'rb') as f:
+        head = f.read(5)
+    if head == b'dummy':
+        print("SIMULATION: Detected dummy WAV file. Generating placeholder image.")
+        _ensure_dir(os.path.dirname(output_path))
+
+        if Image is not None:
+            _render_placeholder_pil(output_path, width_px, height_px)
+        else:
+            _render_placeholder_mpl(output_path, width_px, height_px, dpi)
+        return True
 
     # --- Real File Processing ---
     try:
         samplerate, data = wavfile.read(wav_path)
-        
+
         if data.ndim > 1:
             data = data[:, 0]
-            
-        fig_width_inches = width_px / dpi
-        fig_height_inches = height_px / dpi
-        fig, ax = plt.subplots(figsize=(fig_width_inches, fig_height_inches))
-        
-        ax.plot(data, color='#007bff', linewidth=0.5)
-        
-        ax.axis('off')
-        fig.patch.set_alpha(0)
-        ax.patch.set_alpha(0)
-        ax.set_xlim(0, len(data))
-        ax.set_ylim(data.min(), data.max())
-        plt.tight_layout(pad=0)
-        
-        output_dir = os.path.dirname(output_path)
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            
-        fig.savefig(output_path, dpi=dpi, format='png', transparent=True, pad_inches=0)
-        plt.close(fig)
-        
+
+        _ensure_dir(os.path.dirname(output_path))
+
+        if Image is not None:
+            mins, maxs = _column_minmax(data, width_px)
+            _render_envelope_pil(mins, maxs, output_path, width_px, height_px)
+        else:
+            _render_envelope_mpl(data, output_path, width_px, height_px, dpi)
+
         print(f"Waveform image generated at {output_path}")
         return True
 
     except Exception as e:
         print(f"Error generating waveform for {wav_path}: {e}")
-        return False
\ No newline at end of file
+        return False